@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+
+"""Intinor Direkt API Python tutorial
+
+Example 8: Take a snapshot of a unit's configuration and restore or clone it
+           onto one or several units
+
+Usage:
+    example_08_snapshot_and_restore_configuration.py snapshot
+    example_08_snapshot_and_restore_configuration.py restore
+"""
+
+import sys
+import json
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+# The "direkt" module wraps the "requests" library with some convenient
+# functionality for the Direkt API.
+import direkt
+
+
+# START of configuration
+
+# Replace the below example ID "D0****" with the ID of the Direkt unit whose
+# configuration you wish to store in a snapshot.
+# Case-sensitive: Write the Direkt ID with a capital "D".
+DIREKT_ID = "D0****"
+
+# Replace the below example IDs with the IDs of the Direkt units onto which the
+# snapshot shall be restored. Use the same ID as "DIREKT_ID" to restore a
+# snapshot onto the unit it was taken from, or several IDs to clone a golden
+# configuration onto many units.
+TARGET_DIREKT_IDS = ["D0****"]
+
+# Assign "DIREKT_HOST" the hostname or IP address of your Direkt unit or
+# "iss.intinor.com" if you want to send requests to the API through ISS.
+# Cloning onto several units is most convenient through ISS.
+DIREKT_HOST = "Hostname-or-IP-address"
+
+# Adjust the number of video inputs and encoders to your unit type. Set
+# "INCLUDE_RECORDING" to False for Direkt Receiver, which has no recording
+# options.
+NUMBER_OF_VIDEO_INPUTS = 1
+NUMBER_OF_ENCODERS = 1
+INCLUDE_RECORDING = True
+
+# The snapshot is stored in and read from this file.
+SNAPSHOT_FILE = "./snapshot.json"
+
+# The maximum number of requests that are sent at the same time.
+MAX_PARALLEL_REQUESTS = 16
+
+# A request is given up after "REQUEST_TIMEOUT" seconds, so an unreachable
+# unit does not hold up the restore onto the other units.
+REQUEST_TIMEOUT = 10
+
+# Replace username and password in the authentication below with the actual
+# username and password for your Direkt unit or for your ISS account, if you
+# assigned "DIREKT_HOST" with "iss.intinor.com".
+AUTHENTICATION = ("username", "password")
+
+# NOTES:
+
+# Writing credentials into a script is not a secure practise but it makes a
+# quick and easy start possible. Choose a more secure approach for usage beyond
+# this tutorial.
+
+# The default credentials for your Direkt unit can only be used through local
+# network connections and we recommend changing them for security. This can be
+# done in the unit's webinterface or in ISS.
+
+# We recommend creating a shared API user account for your team.
+
+# END of configuration
+
+
+# The snapshot file format version. It is stored in every snapshot so that a
+# later version of this script can recognise older snapshots.
+SNAPSHOT_VERSION = 1
+
+# The settings resources that make up the configuration of a unit. Each path is
+# relative to the unit URL. In the API the numbering starts at 0.
+SETTINGS_PATHS = (
+    ["/video_inputs/" + str(i) + "/settings"
+     for i in range(NUMBER_OF_VIDEO_INPUTS)] +
+    ["/encoders/" + str(i) + "/settings"
+     for i in range(NUMBER_OF_ENCODERS)] +
+    (["/recording/settings"] if INCLUDE_RECORDING else []))
+
+
+def unit_url(direkt_id):
+    """Help function to create the URL to the API root of a unit"""
+
+    return "https://" + DIREKT_HOST + "/api/v1/units/" + direkt_id
+
+
+def get_settings(url):
+    """Help function to obtain a settings resource without its metadata.
+    Returns the settings and None, or None and an error message if the
+    request failed.
+    """
+
+    try:
+        response = direkt.get(url, auth=AUTHENTICATION,
+                              timeout=REQUEST_TIMEOUT)
+    except OSError as error:
+        # Connection errors are reported instead of ending the whole run.
+        return None, "GET '" + url + "' failed: " + str(error)
+
+    if not response.ok:
+        return None, ("GET '" + url + "' failed: " + response.text)
+
+    settings = response.json()
+
+    # Strip metadata before storing or comparing. The links differ between
+    # units and are not part of the configuration.
+    settings.pop("_links", None)
+
+    return settings, None
+
+
+def put_settings(url, settings):
+    """Help function to update a settings resource. Returns None, or an error
+    message if the request failed.
+    """
+
+    try:
+        response = direkt.put(url, auth=AUTHENTICATION, json=settings,
+                              timeout=REQUEST_TIMEOUT)
+    except OSError as error:
+        return "PUT '" + url + "' failed: " + str(error)
+
+    if not response.ok:
+        return "PUT '" + url + "' failed: " + response.text
+
+    return None
+
+
+def snapshot():
+    """Store all settings resources of a unit in one snapshot file"""
+
+    urls = [unit_url(DIREKT_ID) + path for path in SETTINGS_PATHS]
+
+    # Obtain all settings resources at the same time instead of one after the
+    # other. "map" returns the results in the same order as "urls".
+    with ThreadPoolExecutor(MAX_PARALLEL_REQUESTS) as executor:
+        results = list(executor.map(get_settings, urls))
+
+    # An incomplete snapshot cannot be restored, so nothing is stored if a
+    # settings resource could not be obtained.
+    errors = [error for _, error in results if error]
+    if errors:
+        print("\n".join(errors))
+        sys.exit("Snapshot of " + DIREKT_ID + " failed.")
+
+    resources = dict(zip(SETTINGS_PATHS,
+                         [settings for settings, _ in results]))
+
+    bundle = {
+        "version": SNAPSHOT_VERSION,
+        "direkt_id": DIREKT_ID,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "resources": resources,
+    }
+
+    with open(SNAPSHOT_FILE, "w") as snapshot_file:
+        json.dump(bundle, snapshot_file, indent=2, sort_keys=True)
+
+    print("Stored " + str(len(resources)) + " settings resources of " +
+          DIREKT_ID + " in '" + SNAPSHOT_FILE + "'")
+
+
+def restore_resource(target):
+    """Help function to restore one settings resource on one unit. Returns
+    "unchanged", "updated" or an error message.
+    """
+
+    url, settings = target
+
+    current, error = get_settings(url)
+    if error:
+        return error
+
+    # Only the resources that differ from the snapshot are updated. This
+    # saves requests and leaves unchanged resources untouched on the units.
+    if current == settings:
+        return "unchanged"
+
+    return put_settings(url, settings) or "updated"
+
+
+def restore():
+    """Restore a snapshot onto all target units, updating only the settings
+    resources that differ
+    """
+
+    with open(SNAPSHOT_FILE) as snapshot_file:
+        bundle = json.load(snapshot_file)
+
+    if bundle.get("version") != SNAPSHOT_VERSION:
+        sys.exit("Unsupported snapshot version: " + str(bundle.get("version")))
+
+    resources = bundle["resources"]
+
+    # List every settings resource on every target unit together with the
+    # settings it shall have according to the snapshot.
+    targets = [(direkt_id, unit_url(direkt_id) + path, settings)
+               for direkt_id in TARGET_DIREKT_IDS
+               for path, settings in resources.items()]
+
+    # Restore all resources at the same time. A failure on one unit does not
+    # stop the others, all results are collected for the summary below.
+    with ThreadPoolExecutor(MAX_PARALLEL_REQUESTS) as executor:
+        results = list(executor.map(restore_resource,
+                                    [(url, settings)
+                                     for _, url, settings in targets]))
+
+    print("Restored snapshot of " + bundle["direkt_id"] + ":")
+
+    failed_units = 0
+    for direkt_id in TARGET_DIREKT_IDS:
+        unit_results = [result for (target_id, _, _), result in
+                        zip(targets, results) if target_id == direkt_id]
+        errors = [result for result in unit_results
+                  if result not in ("updated", "unchanged")]
+
+        print(direkt_id + ": " + str(unit_results.count("updated")) +
+              " updated, " + str(unit_results.count("unchanged")) +
+              " unchanged, " + str(len(errors)) + " failed")
+        for error in errors:
+            print("    " + error)
+
+        if errors:
+            failed_units += 1
+
+    if failed_units:
+        sys.exit("Restore failed on " + str(failed_units) + " of " +
+                 str(len(TARGET_DIREKT_IDS)) + " unit(s).")
+
+
+def main():
+    """Take a snapshot or restore it, depending on the command line"""
+
+    if len(sys.argv) != 2 or sys.argv[1] not in ("snapshot", "restore"):
+        sys.exit(__doc__)
+
+    if sys.argv[1] == "snapshot":
+        snapshot()
+    else:
+        restore()
+
+
+if __name__ == '__main__':
+    main()
+
+
+# A snapshot only stores the settings resources listed in "SETTINGS_PATHS".
+# Add more settings resources to the list to include them in the snapshot.
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+
+"""Intinor Direkt API Python tutorial
+
+Example 9: Share status requests between several consumers through request
+           coalescing and a short-lived cache
+"""
+
+import sys
+import time
+import threading
+
+# The "direkt" module wraps the "requests" library with some convenient
+# functionality for the Direkt API.
+import direkt
+
+
+# START of configuration
+
+# Replace the below example ID "D0****" with the ID of your Direkt unit.
+# Case-sensitive: Write the Direkt ID with a capital "D".
+DIREKT_ID = "D0****"
+
+# Assign "DIREKT_HOST" the hostname or IP address of your Direkt unit or
+# "iss.intinor.com" if you want to send requests to the API through ISS.
+DIREKT_HOST = "Hostname-or-IP-address"
+
+# Adjust the value for "ENCODER_NUMBER" to the number of the encoder whose
+# status is shared between the consumers.
+ENCODER_NUMBER = 1
+
+# A response is reused for repeated requests of the same URL for this many
+# seconds. Keep it short for status resources, which change all the time. Set
+# it to 0 to only share requests that are in progress at the same time.
+CACHE_TTL = 0.5
+
+# Replace username and password in the authentication below with the actual
+# username and password for your Direkt unit or for your ISS account, if you
+# assigned "DIREKT_HOST" with "iss.intinor.com".
+AUTHENTICATION = ("username", "password")
+
+# NOTES:
+
+# Writing credentials into a script is not a secure practise but it makes a
+# quick and easy start possible. Choose a more secure approach for usage beyond
+# this tutorial.
+
+# The default credentials for your Direkt unit can only be used through local
+# network connections and we recommend changing them for security. This can be
+# done in the unit's webinterface or in ISS.
+
+# We recommend creating a shared API user account for your team.
+
+# END of configuration
+
+
+# In the API the numbering starts at 0, e.g. "/0/" refers to the first encoder.
+# For convenience, in this code "-1" is automatically applied to
+# "ENCODER_NUMBER" to calculate "ENCODER_NUMBER_API".
+ENCODER_NUMBER_API = str(ENCODER_NUMBER - 1)
+
+# The URL for the encoder status is created here.
+URL = ("https://" + DIREKT_HOST + "/api/v1/units/" + DIREKT_ID +
+       "/encoders/" + ENCODER_NUMBER_API + "/status")
+
+
+class CoalescingGetter:
+    """Sends GET requests so that concurrent requests for the same URL share
+    one request to the unit, and repeated requests within "ttl" seconds are
+    answered from a cache
+    """
+
+    def __init__(self, ttl, **kwargs):
+        self.ttl = ttl
+        self.kwargs = kwargs
+        self.lock = threading.Lock()
+
+        # Finished responses by URL, as (time of arrival, response).
+        self.cache = {}
+
+        # Requests in progress by URL, as (event, result). The event is set
+        # when the request has finished and the result list holds the
+        # response or the raised exception.
+        self.in_flight = {}
+
+        # Counters for "metrics".
+        self.calls = 0
+        self.cache_hits = 0
+        self.coalesced = 0
+        self.requests = 0
+
+    def get(self, url):
+        """Return a response for "url", sending a request only if neither a
+        recent nor an in-progress response is available
+        """
+
+        with self.lock:
+            self.calls += 1
+
+            cached = self.cache.get(url)
+            if cached and time.monotonic() - cached[0] < self.ttl:
+                self.cache_hits += 1
+                return cached[1]
+
+            if url in self.in_flight:
+                # Another consumer is already requesting this URL. Wait for
+                # its response instead of sending a request of our own.
+                self.coalesced += 1
+                event, result = self.in_flight[url]
+                leader = False
+            else:
+                self.requests += 1
+                event, result = threading.Event(), []
+                self.in_flight[url] = (event, result)
+                leader = True
+
+        if not leader:
+            event.wait()
+            if isinstance(result[0], BaseException):
+                raise result[0]
+            return result[0]
+
+        # Only the first consumer sends the request. The lock is not held
+        # meanwhile, so requests for other URLs are not blocked.
+        try:
+            response = direkt.get(url, **self.kwargs)
+            result.append(response)
+        except BaseException as error:
+            # Also pass on e.g. "KeyboardInterrupt", so the waiting consumers
+            # always find a result.
+            result.append(error)
+            raise
+        finally:
+            with self.lock:
+                del self.in_flight[url]
+                # Failed requests are not cached, the next call retries.
+                if (result and not isinstance(result[0], BaseException) and
+                        result[0].ok):
+                    self.cache[url] = (time.monotonic(), result[0])
+            event.set()
+
+        return response
+
+    def metrics(self):
+        """Return the counters and the share of calls that did not cause a
+        request to the unit
+        """
+
+        with self.lock:
+            saved = self.cache_hits + self.coalesced
+            return {
+                "calls": self.calls,
+                "cache_hits": self.cache_hits,
+                "coalesced": self.coalesced,
+                "requests": self.requests,
+                "hit_rate": self.cache_hits / self.calls if self.calls else 0,
+                "coalesce_rate": (self.coalesced / self.calls
+                                  if self.calls else 0),
+                "saved_rate": saved / self.calls if self.calls else 0,
+            }
+
+
+def consumer(name, getter, interval, count, failures):
+    """Poll the encoder status like an independent part of a service, e.g. a
+    dashboard or an alerting component. A failed request is added to
+    "failures", as "sys.exit" would only end this thread.
+    """
+
+    for _ in range(count):
+        response = getter.get(URL)
+
+        if not response.ok:
+            print(response.text)
+            print(name + ": GET '" + URL + "' failed.")
+            failures.append(name)
+            return
+
+        encoder = response.json()
+        print(name + ": total bitrate " +
+              str(encoder["encoding"]["total_bitrate"]))
+
+        time.sleep(interval)
+
+
+def main():
+    """Let three consumers poll the same encoder status through one
+    coalescing getter
+    """
+
+    getter = CoalescingGetter(CACHE_TTL, auth=AUTHENTICATION)
+    failures = []
+
+    # The consumers poll at different intervals, as they would in a service.
+    threads = [
+        threading.Thread(target=consumer,
+                         args=(name, getter, interval, 10, failures))
+        for name, interval in (("dashboard", 1.0), ("alerting", 0.5),
+                               ("exporter", 2.0))
+    ]
+
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Show how many of the calls were answered without a request to the unit.
+    for key, value in getter.metrics().items():
+        print(key + ": " + str(round(value, 3)))
+
+    if failures:
+        sys.exit("GET '" + URL + "' failed for " + ", ".join(failures) + ".")
+
+
+if __name__ == '__main__':
+    main()
+
+
+# Share one "CoalescingGetter" between all parts of your service to benefit
+# from it. The number of requests to your unit then stays about the same no
+# matter how many consumers read the status.
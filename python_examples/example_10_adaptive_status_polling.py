@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+
+"""Intinor Direkt API Python tutorial
+
+Example 10: Poll status information at adaptive intervals that follow how
+            quickly the values change
+"""
+
+import time
+import heapq
+import queue
+from concurrent.futures import ThreadPoolExecutor
+
+# The "direkt" module wraps the "requests" library with some convenient
+# functionality for the Direkt API.
+import direkt
+
+
+# START of configuration
+
+# Replace the below example IDs "D0****" with the IDs of your Direkt units.
+# Case-sensitive: Write the Direkt IDs with a capital "D".
+DIREKT_IDS = ["D0****"]
+
+# Assign "DIREKT_HOST" the hostname or IP address of your Direkt unit or
+# "iss.intinor.com" if you want to send requests to the API through ISS.
+DIREKT_HOST = "Hostname-or-IP-address"
+
+# Adjust the list "ENCODER_NUMBERS" to the numbers of the encoders which you
+# want to poll on each unit.
+ENCODER_NUMBERS = [1]
+
+# The status elements that are watched for changes. Each element is given as
+# its path of keys in the encoder status.
+WATCHED_FIELDS = [
+    ("encoding", "total_bitrate"),
+    ("encoding", "video", "format"),
+]
+
+# Alert thresholds for numeric status elements. Polling is done at the
+# shortest interval while a value is within "THRESHOLD_MARGIN" (20 %) of its
+# threshold.
+THRESHOLDS = {
+    ("encoding", "total_bitrate"): 1000,
+}
+THRESHOLD_MARGIN = 0.2
+
+# The polling interval in seconds is kept between these limits. It is halved
+# whenever a watched status element changes and multiplied by
+# "BACKOFF_FACTOR" whenever nothing changed.
+MIN_INTERVAL = 0.5
+MAX_INTERVAL = 30
+BACKOFF_FACTOR = 1.5
+
+# A slow unit is not polled more often than every "SLOW_UNIT_FACTOR" times its
+# response time.
+SLOW_UNIT_FACTOR = 4
+
+# The maximum number of requests per minute for each unit, and in total for
+# the ISS account if "DIREKT_HOST" is "iss.intinor.com".
+MAX_REQUESTS_PER_MINUTE_PER_UNIT = 60
+MAX_REQUESTS_PER_MINUTE_PER_ISS_ACCOUNT = 300
+
+# A request is given up after "REQUEST_TIMEOUT" seconds and at most
+# "MAX_PARALLEL_REQUESTS" requests are sent at the same time, so a slow or
+# unreachable unit does not hold up the polling of the other units.
+REQUEST_TIMEOUT = 10
+MAX_PARALLEL_REQUESTS = 16
+
+# The polling stops after this many seconds.
+RUN_TIME = 120
+
+# Replace username and password in the authentication below with the actual
+# username and password for your Direkt unit or for your ISS account, if you
+# assigned "DIREKT_HOST" with "iss.intinor.com".
+AUTHENTICATION = ("username", "password")
+
+# NOTES:
+
+# Writing credentials into a script is not a secure practise but it makes a
+# quick and easy start possible. Choose a more secure approach for usage beyond
+# this tutorial.
+
+# The default credentials for your Direkt unit can only be used through local
+# network connections and we recommend changing them for security. This can be
+# done in the unit's webinterface or in ISS.
+
+# We recommend creating a shared API user account for your team.
+
+# END of configuration
+
+
+def status_url(direkt_id, encoder_number):
+    """Help function to create the URL for an encoder status. In the API the
+    numbering starts at 0, therefore "-1" is applied to "encoder_number".
+    """
+
+    return ("https://" + DIREKT_HOST + "/api/v1/units/" + direkt_id +
+            "/encoders/" + str(encoder_number - 1) + "/status")
+
+
+def get_field(resource, path):
+    """Help function to look up a status element by its path of keys.
+    Returns None if the element is missing.
+    """
+
+    for key in path:
+        if not isinstance(resource, dict) or key not in resource:
+            return None
+        resource = resource[key]
+    return resource
+
+
+class RequestBudget:
+    """Allows at most "per_minute" requests per minute, spread evenly"""
+
+    def __init__(self, per_minute):
+        self.seconds_per_request = 60 / per_minute
+        self.next_free = time.monotonic()
+
+    def wait_time(self):
+        """Return how many seconds to wait until a request is allowed"""
+
+        return max(0, self.next_free - time.monotonic())
+
+    def spend(self):
+        """Use up the budget for one request"""
+
+        self.next_free = (max(self.next_free, time.monotonic()) +
+                          self.seconds_per_request)
+
+
+class StatusPoller:
+    """Polls one encoder status and adapts its own polling interval"""
+
+    def __init__(self, direkt_id, encoder_number):
+        self.direkt_id = direkt_id
+        self.encoder_number = encoder_number
+        self.url = status_url(direkt_id, encoder_number)
+        self.interval = MIN_INTERVAL
+        self.values = None
+
+    def near_threshold(self, values):
+        """Return True if a watched value is close to its alert threshold"""
+
+        for path, threshold in THRESHOLDS.items():
+            value = values.get(path)
+            margin = abs(threshold) * THRESHOLD_MARGIN
+            if (isinstance(value, (int, float)) and
+                    abs(value - threshold) <= margin):
+                return True
+        return False
+
+    def poll(self):
+        """Obtain the status, report changes and return the time in seconds
+        until the next poll
+        """
+
+        start = time.monotonic()
+        try:
+            response = direkt.get(self.url, auth=AUTHENTICATION,
+                                  timeout=REQUEST_TIMEOUT)
+            if not response.ok:
+                print(response.text)
+            encoder = response.json() if response.ok else None
+        except (OSError, ValueError) as error:
+            # Connection errors, timeouts and invalid responses.
+            print(error)
+            encoder = None
+        response_time = time.monotonic() - start
+
+        # A failed poll does not stop the polling. The unit is polled again
+        # at the longest interval.
+        if encoder is None:
+            print("GET '" + self.url + "' failed.")
+            self.interval = MAX_INTERVAL
+            return MAX_INTERVAL
+
+        values = {path: get_field(encoder, path)
+                  for path in WATCHED_FIELDS + list(THRESHOLDS)}
+
+        changed = [path for path in WATCHED_FIELDS
+                   if self.values is not None and
+                   values[path] != self.values[path]]
+        for path in changed:
+            print(self.direkt_id + " encoder " + str(self.encoder_number) +
+                  ": " + "/".join(path) + " = " + str(values[path]))
+
+        # Poll more often while something is happening and back off while the
+        # values are stable.
+        if changed or self.near_threshold(values):
+            self.interval = max(MIN_INTERVAL, self.interval / 2)
+        else:
+            self.interval = min(MAX_INTERVAL, self.interval * BACKOFF_FACTOR)
+
+        self.values = values
+
+        # Give slow units time to recover.
+        return max(self.interval, response_time * SLOW_UNIT_FACTOR)
+
+
+def main():
+    """Poll all configured encoders until "RUN_TIME" has passed"""
+
+    pollers = [StatusPoller(direkt_id, encoder_number)
+               for direkt_id in DIREKT_IDS
+               for encoder_number in ENCODER_NUMBERS]
+
+    unit_budgets = {direkt_id: RequestBudget(MAX_REQUESTS_PER_MINUTE_PER_UNIT)
+                    for direkt_id in DIREKT_IDS}
+
+    # Requests through ISS also share the budget of the ISS account.
+    iss_budget = None
+    if DIREKT_HOST == "iss.intinor.com":
+        iss_budget = RequestBudget(MAX_REQUESTS_PER_MINUTE_PER_ISS_ACCOUNT)
+
+    # The pollers are kept in a heap ordered by the time of their next poll.
+    # The index breaks ties, as pollers themselves cannot be compared.
+    now = time.monotonic()
+    schedule = [(now, index) for index in range(len(pollers))]
+    heapq.heapify(schedule)
+    end = now + RUN_TIME
+    requests_sent = 0
+
+    # Finished polls report (index, delay until the next poll) here. A poller
+    # is not in the heap while its poll is running.
+    finished = queue.Queue()
+
+    with ThreadPoolExecutor(MAX_PARALLEL_REQUESTS) as executor:
+        while True:
+            # Schedule the next poll of all pollers that have finished.
+            while not finished.empty():
+                index, delay = finished.get()
+                heapq.heappush(schedule, (time.monotonic() + delay, index))
+
+            now = time.monotonic()
+            if now >= end:
+                break
+
+            if not schedule or schedule[0][0] > now:
+                # Wait until the next poll is due or a poll has finished.
+                wake_up = min(schedule[0][0] if schedule else end, end)
+                try:
+                    index, delay = finished.get(timeout=wake_up - now)
+                    heapq.heappush(schedule,
+                                   (time.monotonic() + delay, index))
+                except queue.Empty:
+                    pass
+                continue
+
+            _, index = heapq.heappop(schedule)
+            poller = pollers[index]
+            budgets = [unit_budgets[poller.direkt_id]]
+            if iss_budget:
+                budgets.append(iss_budget)
+
+            # Postpone the poll if it would exceed a request budget.
+            wait = max(budget.wait_time() for budget in budgets)
+            if wait > 0:
+                heapq.heappush(schedule, (now + wait, index))
+                continue
+
+            for budget in budgets:
+                budget.spend()
+
+            future = executor.submit(poller.poll)
+            future.add_done_callback(
+                lambda future, index=index: finished.put(
+                    (index, future.result())))
+            requests_sent += 1
+
+    print("Sent " + str(requests_sent) + " requests in " + str(RUN_TIME) +
+          " seconds. Polling every 2 seconds would have sent " +
+          str(len(pollers) * RUN_TIME // 2) + " requests.")
+
+
+if __name__ == '__main__':
+    main()
+
+
+# Compared to Example 6 the status is obtained more often while the watched
+# values change and less often while they are stable.
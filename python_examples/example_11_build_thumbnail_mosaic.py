@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+
+"""Intinor Direkt API Python tutorial
+
+Example 11: Build a labelled mosaic of thumbnail images from the video inputs
+            of several units
+
+This example requires the "Pillow" library to be installed.
+"""
+
+import io
+import sys
+import time
+import hashlib
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+from PIL import Image, ImageDraw
+
+# The "direkt" module wraps the "requests" library with some convenient
+# functionality for the Direkt API.
+import direkt
+
+
+# START of configuration
+
+# Replace the below example ID "D0****" with the IDs of your Direkt units and
+# assign each ID the number of video inputs that shall be shown for that unit.
+# Case-sensitive: Write the Direkt IDs with a capital "D".
+UNITS = {
+    "D0****": 1,
+}
+
+# Assign "DIREKT_HOST" the hostname or IP address of your Direkt unit or
+# "iss.intinor.com" if you want to send requests to the API through ISS.
+# Building a mosaic of several units is most convenient through ISS.
+DIREKT_HOST = "Hostname-or-IP-address"
+
+# The size of each tile in the mosaic in pixels and the number of tiles per
+# row.
+TILE_WIDTH = 320
+TILE_HEIGHT = 180
+COLUMNS = 10
+
+# The mosaic is rebuilt "NUMBER_OF_REFRESHES" times, every
+# "REFRESH_INTERVAL" seconds.
+NUMBER_OF_REFRESHES = 30
+REFRESH_INTERVAL = 5
+
+# The mosaic is stored in this file.
+MOSAIC_FILE = "./mosaic.png"
+
+# The maximum number of requests that are sent at the same time.
+MAX_PARALLEL_REQUESTS = 32
+
+# A request is given up after "REQUEST_TIMEOUT" seconds, so an unreachable
+# unit does not hold up the refresh of the other tiles.
+REQUEST_TIMEOUT = 3
+
+# Replace username and password in the authentication below with the actual
+# username and password for your Direkt unit or for your ISS account, if you
+# assigned "DIREKT_HOST" with "iss.intinor.com".
+AUTHENTICATION = ("username", "password")
+
+# NOTES:
+
+# Writing credentials into a script is not a secure practise but it makes a
+# quick and easy start possible. Choose a more secure approach for usage beyond
+# this tutorial.
+
+# The default credentials for your Direkt unit can only be used through local
+# network connections and we recommend changing them for security. This can be
+# done in the unit's webinterface or in ISS.
+
+# We recommend creating a shared API user account for your team.
+
+# END of configuration
+
+
+# The HTTP status code with which a unit answers if a video input has no
+# thumbnail, e.g. because it has no signal. Such tiles are shown as "No
+# thumbnail". Tiles whose request failed for another reason are shown as
+# "Unavailable", and the script ends only if the requests of all tiles failed.
+NO_THUMBNAIL_STATUS_CODE = 404
+NO_THUMBNAIL = "No thumbnail"
+UNAVAILABLE = "Unavailable"
+
+# The height of the label bar at the bottom of each tile in pixels.
+LABEL_HEIGHT = 16
+
+# Every tile is identified by its unit ID and the video input number as used
+# in the API, where the numbering starts at 0.
+TILES = [(direkt_id, video_input)
+         for direkt_id, number_of_inputs in UNITS.items()
+         for video_input in range(number_of_inputs)]
+
+
+def video_input_url(direkt_id, video_input):
+    """Help function to create the URL to a video input"""
+
+    return ("https://" + DIREKT_HOST + "/api/v1/units/" + direkt_id +
+            "/video_inputs/" + str(video_input))
+
+
+def get_description(tile):
+    """Obtain the description of a video input from its settings. Returns
+    None if the request failed.
+    """
+
+    url = video_input_url(*tile) + "/settings"
+    try:
+        response = direkt.get(url, auth=AUTHENTICATION,
+                              timeout=REQUEST_TIMEOUT)
+        if response.ok:
+            return response.json()["description"]
+        print(response.text)
+    except (OSError, ValueError) as error:
+        # Connection errors, timeouts and invalid responses.
+        print(error)
+
+    print("GET '" + url + "' failed.")
+    return None
+
+
+def get_thumbnail(tile):
+    """Obtain a thumbnail image of a video input. The unit scales the image to
+    the tile width, which keeps the download small. Returns the text to show
+    instead, "NO_THUMBNAIL" or "UNAVAILABLE", if there is no image.
+    """
+
+    url = video_input_url(*tile) + "/thumbnails/0?width=" + str(TILE_WIDTH)
+    try:
+        response = direkt.get(url, auth=AUTHENTICATION,
+                              timeout=REQUEST_TIMEOUT)
+    except OSError as error:
+        # Connection errors and timeouts.
+        print("GET '" + url + "' failed: " + str(error))
+        return UNAVAILABLE
+
+    if response.status_code == NO_THUMBNAIL_STATUS_CODE:
+        return NO_THUMBNAIL
+
+    if not response.ok:
+        print(response.text)
+        print("GET '" + url + "' failed.")
+        return UNAVAILABLE
+
+    return response.content
+
+
+def render_tile(thumbnail, label):
+    """Decode, scale and label one tile. This function runs in a separate
+    process, so it only receives and returns plain data.
+    """
+
+    tile = Image.new("RGB", (TILE_WIDTH, TILE_HEIGHT))
+    draw = ImageDraw.Draw(tile)
+    picture_height = TILE_HEIGHT - LABEL_HEIGHT
+
+    if isinstance(thumbnail, str):
+        draw.text((4, picture_height // 2), thumbnail, fill="gray")
+    else:
+        picture = Image.open(io.BytesIO(thumbnail)).convert("RGB")
+        picture.thumbnail((TILE_WIDTH, picture_height))
+        tile.paste(picture, ((TILE_WIDTH - picture.width) // 2,
+                             (picture_height - picture.height) // 2))
+
+    draw.text((4, picture_height + 2), label, fill="white")
+
+    return tile.tobytes()
+
+
+def main():
+    """Build the mosaic repeatedly, rendering only the changed tiles"""
+
+    rows = (len(TILES) + COLUMNS - 1) // COLUMNS
+    mosaic = Image.new("RGB", (min(len(TILES), COLUMNS) * TILE_WIDTH,
+                               rows * TILE_HEIGHT))
+
+    # A fingerprint of the latest thumbnail of each tile. A tile is only
+    # rendered again if its thumbnail has a new fingerprint.
+    fingerprints = {}
+
+    downloads = ThreadPoolExecutor(MAX_PARALLEL_REQUESTS)
+    renderers = ProcessPoolExecutor()
+
+    with downloads, renderers:
+
+        descriptions = list(downloads.map(get_description, TILES))
+        if not any(description is not None for description in descriptions):
+            sys.exit("The descriptions of all video inputs failed.")
+
+        labels = [direkt_id + " input " + str(video_input + 1) + ": " +
+                  (description if description is not None else "?")
+                  for (direkt_id, video_input), description in
+                  zip(TILES, descriptions)]
+
+        for _ in range(NUMBER_OF_REFRESHES):
+            start = time.monotonic()
+
+            # Download all thumbnails at the same time.
+            thumbnails = list(downloads.map(get_thumbnail, TILES))
+
+            # A wrong password or host makes all requests fail.
+            if all(thumbnail == UNAVAILABLE for thumbnail in thumbnails):
+                sys.exit("The thumbnails of all video inputs failed.")
+
+            changed = []
+            for index, thumbnail in enumerate(thumbnails):
+                fingerprint = (hashlib.sha1(thumbnail).digest()
+                               if isinstance(thumbnail, bytes) else thumbnail)
+                if (index not in fingerprints or
+                        fingerprints[index] != fingerprint):
+                    fingerprints[index] = fingerprint
+                    changed.append(index)
+
+            # Decode and scale the changed tiles in parallel processes, which
+            # are not limited by the Global Interpreter Lock.
+            tiles = renderers.map(render_tile,
+                                  [thumbnails[index] for index in changed],
+                                  [labels[index] for index in changed])
+
+            for index, tile in zip(changed, tiles):
+                row, column = divmod(index, COLUMNS)
+                mosaic.paste(Image.frombytes("RGB", (TILE_WIDTH, TILE_HEIGHT),
+                                             tile),
+                             (column * TILE_WIDTH, row * TILE_HEIGHT))
+
+            if changed:
+                mosaic.save(MOSAIC_FILE)
+
+            print("Updated " + str(len(changed)) + " of " + str(len(TILES)) +
+                  " tiles in " + str(round(time.monotonic() - start, 2)) +
+                  " seconds")
+
+            time.sleep(max(0, REFRESH_INTERVAL - (time.monotonic() - start)))
+
+    print("Use an image viewer to see '" + MOSAIC_FILE + "'")
+
+
+if __name__ == '__main__':
+    main()
+
+
+# The descriptions are obtained once at the start. Restart the script to show
+# updated descriptions in the labels.
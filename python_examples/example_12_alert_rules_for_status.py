@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+
+"""Intinor Direkt API Python tutorial
+
+Example 12: Evaluate declarative alert rules against the encoder status of
+            several units
+"""
+
+import sys
+import time
+import operator
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# The "direkt" module wraps the "requests" library with some convenient
+# functionality for the Direkt API.
+import direkt
+
+
+# START of configuration
+
+# Replace the below example IDs "D0****" with the IDs of your Direkt units.
+# Case-sensitive: Write the Direkt IDs with a capital "D".
+DIREKT_IDS = ["D0****"]
+
+# Assign "DIREKT_HOST" the hostname or IP address of your Direkt unit or
+# "iss.intinor.com" if you want to send requests to the API through ISS.
+DIREKT_HOST = "Hostname-or-IP-address"
+
+# Adjust the list "ENCODER_NUMBERS" to the numbers of the encoders which you
+# want to watch on each unit.
+ENCODER_NUMBERS = [1]
+
+# The alert rules. Each rule has:
+#   "name":  A name that is shown when the alert fires or is resolved.
+#   "field": The path to the status element, separated with "/". Numbers
+#            select an entry in a list, e.g. "audio/0" is the first audio
+#            stream.
+#   "op":    One of "<", "<=", ">", ">=", "==", "!=" or "changed".
+#   "value": The value that the status element is compared with.
+# Optional:
+#   "for":   The alert only fires if the condition holds for this many
+#            seconds.
+#   "clear": Hysteresis. A firing alert is only resolved once the condition
+#            no longer holds for this value, e.g. a low bitrate alert fires
+#            below 1000 but is resolved only above 1200.
+# The "changed" rules fire every time the status element changes. A firing
+# alert whose status element disappears from the status ends with a "MISSING"
+# event.
+RULES = [
+    {"name": "Low total bitrate", "field": "encoding/total_bitrate",
+     "op": "<", "value": 1000, "for": 10, "clear": 1200},
+    {"name": "Framerate changed", "field": "encoding/video/format/framerate",
+     "op": "changed"},
+    {"name": "Audio channels dropped",
+     "field": "encoding/audio/0/format/channels", "op": "<", "value": 2},
+]
+
+# The status of all encoders is obtained "NUMBER_OF_POLLS" times, every
+# "POLL_INTERVAL" seconds.
+NUMBER_OF_POLLS = 30
+POLL_INTERVAL = 2
+
+# The maximum number of requests that are sent at the same time.
+MAX_PARALLEL_REQUESTS = 32
+
+# Replace username and password in the authentication below with the actual
+# username and password for your Direkt unit or for your ISS account, if you
+# assigned "DIREKT_HOST" with "iss.intinor.com".
+AUTHENTICATION = ("username", "password")
+
+# NOTES:
+
+# Writing credentials into a script is not a secure practise but it makes a
+# quick and easy start possible. Choose a more secure approach for usage beyond
+# this tutorial.
+
+# The default credentials for your Direkt unit can only be used through local
+# network connections and we recommend changing them for security. This can be
+# done in the unit's webinterface or in ISS.
+
+# We recommend creating a shared API user account for your team.
+
+# END of configuration
+
+
+COMPARATORS = {
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
+
+def compile_path(field):
+    """Turn a field path like "encoding/audio/0/format" into a function that
+    returns the status element, or None if it is missing
+    """
+
+    keys = tuple(int(key) if key.isdigit() else key
+                 for key in field.split("/"))
+
+    def lookup(status):
+        for key in keys:
+            try:
+                status = status[key]
+            except (KeyError, IndexError, TypeError):
+                return None
+        return status
+
+    return lookup
+
+
+class CompiledRule:
+    """An alert rule that has been checked and prepared for evaluation"""
+
+    def __init__(self, rule):
+        self.name = rule["name"]
+        self.field = rule["field"]
+        self.changed = rule["op"] == "changed"
+        if not self.changed:
+            if rule["op"] not in COMPARATORS:
+                sys.exit("Rule '" + self.name + "' has an unknown op: " +
+                         rule["op"])
+            self.compare = COMPARATORS[rule["op"]]
+            self.value = rule["value"]
+            self.clear = rule.get("clear", self.value)
+        self.duration = rule.get("for", 0)
+
+    def holds(self, value, active):
+        """Return True if the condition holds for "value". A firing alert
+        is compared with the "clear" value instead. A value that cannot be
+        compared, e.g. a text where a number is expected, does not match.
+        """
+
+        try:
+            return self.compare(value, self.clear if active else self.value)
+        except TypeError:
+            return False
+
+
+class RuleEngine:
+    """Evaluates the compiled rules against the status of many encoders and
+    keeps track of which alerts are firing
+    """
+
+    def __init__(self, rules):
+        rules = [CompiledRule(rule) for rule in rules]
+
+        # Each status element is looked up once per status, no matter how
+        # many rules use it, and rules are found by their status element.
+        self.lookups = {rule.field: compile_path(rule.field)
+                        for rule in rules}
+        self.rules_by_field = {}
+        for rule in rules:
+            self.rules_by_field.setdefault(rule.field, []).append(rule)
+
+        # The state per encoder: the previous values of the status elements,
+        # the time since when a rule's condition has held and the firing
+        # rules.
+        self.values = {}
+        self.pending = {}
+        self.active = {}
+
+    def evaluate(self, source, status, now):
+        """Evaluate the rules against a new status of "source" and return the
+        alert events as (event, rule name, value)
+        """
+
+        previous = self.values.setdefault(source, {})
+        pending = self.pending.setdefault(source, {})
+        active = self.active.setdefault(source, set())
+        events = []
+
+        for field, lookup in self.lookups.items():
+            value = lookup(status)
+            if value is None:
+                # Rules on missing status elements are not evaluated. Alerts
+                # that were firing on a status element which disappeared are
+                # ended with a "MISSING" event.
+                if previous.pop(field, None) is not None:
+                    for rule in self.rules_by_field[field]:
+                        pending.pop(rule, None)
+                        if rule in active:
+                            active.remove(rule)
+                            events.append(("MISSING", rule.name, None))
+                continue
+
+            old = previous.get(field)
+            previous[field] = value
+
+            # Only rules on changed status elements, and rules that wait for
+            # their duration to pass, need to be evaluated.
+            if value == old and not any(rule in pending for rule in
+                                        self.rules_by_field[field]):
+                continue
+
+            for rule in self.rules_by_field[field]:
+                if rule.changed:
+                    if old is not None and value != old:
+                        events.append(("CHANGED", rule.name, value))
+                    continue
+
+                if rule.holds(value, rule in active):
+                    if rule not in active:
+                        since = pending.setdefault(rule, now)
+                        if now - since >= rule.duration:
+                            del pending[rule]
+                            active.add(rule)
+                            events.append(("FIRING", rule.name, value))
+                else:
+                    pending.pop(rule, None)
+                    if rule in active:
+                        active.remove(rule)
+                        events.append(("RESOLVED", rule.name, value))
+
+        return events
+
+
+def get_status(source):
+    """Obtain the status of an encoder given as (unit ID, encoder number).
+    Returns the status and None, or None and an error message if the request
+    failed.
+    """
+
+    direkt_id, encoder_number = source
+
+    # In the API the numbering starts at 0, therefore "-1" is applied.
+    url = ("https://" + DIREKT_HOST + "/api/v1/units/" + direkt_id +
+           "/encoders/" + str(encoder_number - 1) + "/status")
+
+    # The timeout keeps a stalled unit from holding back the next poll of
+    # all other encoders.
+    try:
+        response = direkt.get(url, auth=AUTHENTICATION, timeout=POLL_INTERVAL)
+        if not response.ok:
+            return None, "GET '" + url + "' failed: " + response.text
+        return response.json(), None
+    except (OSError, ValueError) as error:
+        # Connection errors, timeouts and invalid responses.
+        return None, "GET '" + url + "' failed: " + str(error)
+
+
+def main():
+    """Poll all encoders and report alerts as soon as a status arrives"""
+
+    engine = RuleEngine(RULES)
+    unreachable = set()
+    sources = [(direkt_id, encoder_number)
+               for direkt_id in DIREKT_IDS
+               for encoder_number in ENCODER_NUMBERS]
+
+    with ThreadPoolExecutor(MAX_PARALLEL_REQUESTS) as executor:
+        for _ in range(NUMBER_OF_POLLS):
+            start = time.monotonic()
+
+            futures = {executor.submit(get_status, source): source
+                       for source in sources}
+
+            # Evaluate each status as soon as it arrives instead of waiting
+            # for the slowest unit.
+            for future in as_completed(futures):
+                source = futures[future]
+                status, error = future.result()
+
+                # A failed poll is reported once as an event and does not
+                # stop the alerting for the other encoders.
+                if error:
+                    if source not in unreachable:
+                        unreachable.add(source)
+                        print("UNREACHABLE: " + source[0] + " encoder " +
+                              str(source[1]) + " (" + error + ")")
+                    continue
+
+                if source in unreachable:
+                    unreachable.remove(source)
+                    print("REACHABLE: " + source[0] + " encoder " +
+                          str(source[1]))
+
+                for event, name, value in engine.evaluate(
+                        source, status, time.monotonic()):
+                    print(event + ": " + name + " on " + source[0] +
+                          " encoder " + str(source[1]) + " (" + str(value) +
+                          ")")
+
+            time.sleep(max(0, POLL_INTERVAL - (time.monotonic() - start)))
+
+
+if __name__ == '__main__':
+    main()
+
+
+# Add your own rules to "RULES". Every field path can be looked up in the
+# encoder status, see Example 6 for how the status looks like.
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+
+"""Intinor Direkt API Python tutorial
+
+Example 13: Export the encoder status of several units as Prometheus metrics
+"""
+
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# The "direkt" module wraps the "requests" library with some convenient
+# functionality for the Direkt API.
+import direkt
+
+
+# START of configuration
+
+# Replace the below example IDs "D0****" with the IDs of your Direkt units.
+# Case-sensitive: Write the Direkt IDs with a capital "D".
+DIREKT_IDS = ["D0****"]
+
+# Assign "DIREKT_HOST" the hostname or IP address of your Direkt unit or
+# "iss.intinor.com" if you want to send requests to the API through ISS.
+DIREKT_HOST = "Hostname-or-IP-address"
+
+# Adjust the list "ENCODER_NUMBERS" to the numbers of the encoders which you
+# want to export on each unit.
+ENCODER_NUMBERS = [1]
+
+# The status of each encoder is obtained every "POLL_INTERVAL" seconds,
+# independently of when Prometheus scrapes the exporter.
+POLL_INTERVAL = 10
+
+# The metrics are served on "http://<this computer>:EXPORTER_PORT/metrics".
+EXPORTER_PORT = 9810
+
+# Replace username and password in the authentication below with the actual
+# username and password for your Direkt unit or for your ISS account, if you
+# assigned "DIREKT_HOST" with "iss.intinor.com".
+AUTHENTICATION = ("username", "password")
+
+# NOTES:
+
+# Writing credentials into a script is not a secure practise but it makes a
+# quick and easy start possible. Choose a more secure approach for usage beyond
+# this tutorial.
+
+# The default credentials for your Direkt unit can only be used through local
+# network connections and we recommend changing them for security. This can be
+# done in the unit's webinterface or in ISS.
+
+# We recommend creating a shared API user account for your team.
+
+# END of configuration
+
+
+# The exported metrics as (name, help text, function that reads the value from
+# the encoder status).
+METRICS = [
+    ("direkt_encoder_total_bitrate", "Total bitrate of the encoder.",
+     lambda encoder: encoder["encoding"]["total_bitrate"]),
+    ("direkt_encoder_video_framerate", "Video framerate of the encoder.",
+     lambda encoder: encoder["encoding"]["video"]["format"]["framerate"]),
+    ("direkt_encoder_video_width", "Video width of the encoder in pixels.",
+     lambda encoder: encoder["encoding"]["video"]["format"]["width"]),
+    ("direkt_encoder_video_height", "Video height of the encoder in pixels.",
+     lambda encoder: encoder["encoding"]["video"]["format"]["height"]),
+    ("direkt_encoder_audio_sample_rate",
+     "Sample rate of the first audio stream of the encoder.",
+     lambda encoder: encoder["encoding"]["audio"][0]["format"]["sample_rate"]),
+    ("direkt_encoder_audio_channels",
+     "Number of channels of the first audio stream of the encoder.",
+     lambda encoder: encoder["encoding"]["audio"][0]["format"]["channels"]),
+]
+
+
+class MetricsStore:
+    """Keeps the latest values of all encoders and a rendered metrics page,
+    which is only rendered again after a value has changed
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+
+        # The latest values by (unit ID, encoder number). "None" means that
+        # the latest poll failed.
+        self.values = {}
+        self.page = b""
+        self.changed = True
+
+    def update(self, source, values):
+        """Store the values of an encoder"""
+
+        with self.lock:
+            if self.values.get(source, ()) != values:
+                self.values[source] = values
+                self.changed = True
+
+    def render(self):
+        """Return the metrics page in the Prometheus text format"""
+
+        with self.lock:
+            if not self.changed:
+                return self.page
+
+            encoders = sorted(self.values.items())
+
+            lines = ["# HELP direkt_encoder_up Whether the latest status "
+                     "poll of the encoder succeeded.",
+                     "# TYPE direkt_encoder_up gauge"]
+            for (direkt_id, encoder_number), values in encoders:
+                lines.append('direkt_encoder_up{unit="' + direkt_id +
+                             '",encoder="' + str(encoder_number) + '"} ' +
+                             ("0" if values is None else "1"))
+
+            for index, (name, help_text, _) in enumerate(METRICS):
+                lines.append("# HELP " + name + " " + help_text)
+                lines.append("# TYPE " + name + " gauge")
+                for (direkt_id, encoder_number), values in encoders:
+                    # Only numeric values can be exported.
+                    if (values is None or
+                            not isinstance(values[index], (int, float))):
+                        continue
+                    lines.append(name + '{unit="' + direkt_id +
+                                 '",encoder="' + str(encoder_number) + '"} ' +
+                                 str(float(values[index])))
+
+            self.page = ("\n".join(lines) + "\n").encode()
+            self.changed = False
+            return self.page
+
+
+def poll(store, source, delay):
+    """Obtain the status of an encoder every "POLL_INTERVAL" seconds and
+    store its values. Runs in its own thread, so a slow unit only delays its
+    own values.
+    """
+
+    direkt_id, encoder_number = source
+
+    # In the API the numbering starts at 0, therefore "-1" is applied.
+    url = ("https://" + DIREKT_HOST + "/api/v1/units/" + direkt_id +
+           "/encoders/" + str(encoder_number - 1) + "/status")
+
+    # Spread the polls of all encoders over the interval.
+    time.sleep(delay)
+
+    while True:
+        start = time.monotonic()
+        values = None
+
+        try:
+            response = direkt.get(url, auth=AUTHENTICATION,
+                                  timeout=POLL_INTERVAL)
+            if response.ok:
+                encoder = response.json()
+                values = []
+                for _, _, read in METRICS:
+                    try:
+                        values.append(read(encoder))
+                    except (KeyError, IndexError, TypeError):
+                        values.append(None)
+            else:
+                print("GET '" + url + "' failed.")
+        except (OSError, ValueError) as error:
+            # Connection errors and invalid responses are reported and the
+            # encoder is exported as down until the next successful poll.
+            print("GET '" + url + "' failed: " + str(error))
+
+        store.update(source, values)
+
+        time.sleep(max(0, POLL_INTERVAL - (time.monotonic() - start)))
+
+
+def make_handler(store):
+    """Create a request handler class that serves the metrics page of
+    "store"
+    """
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        """Serves the rendered metrics page without contacting any unit"""
+
+        def do_GET(self):
+            if self.path != "/metrics":
+                self.send_error(404)
+                return
+
+            page = store.render()
+            self.send_response(200)
+            self.send_header("Content-Type",
+                             "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(page)))
+            self.end_headers()
+            self.wfile.write(page)
+
+        def log_message(self, *args):
+            # Do not print a line for every scrape.
+            pass
+
+    return MetricsHandler
+
+
+def main():
+    """Start polling in the background and serve the metrics"""
+
+    store = MetricsStore()
+    sources = [(direkt_id, encoder_number)
+               for direkt_id in DIREKT_IDS
+               for encoder_number in ENCODER_NUMBERS]
+
+    for index, source in enumerate(sources):
+        delay = POLL_INTERVAL * index / len(sources)
+        threading.Thread(target=poll, args=(store, source, delay),
+                         daemon=True).start()
+
+    server = ThreadingHTTPServer(("", EXPORTER_PORT), make_handler(store))
+    print("Serving metrics on port " + str(EXPORTER_PORT))
+    server.serve_forever()
+
+
+if __name__ == '__main__':
+    main()
+
+
+# The exporter runs until it is stopped with ctrl + c. Add a scrape job for
+# "<this computer>:9810" to your Prometheus configuration.
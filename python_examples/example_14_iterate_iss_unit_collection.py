@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+
+"""Intinor Direkt API Python tutorial
+
+Example 14: Iterate over the units of an ISS account page by page without
+            loading the whole collection into memory
+"""
+
+import sys
+import json
+import time
+import queue
+import threading
+from urllib.parse import urljoin
+import requests
+
+
+# This example connects through ISS without using the "direkt" module, like
+# Example 2, and keeps one "requests" session for all pages so that the
+# connection to ISS is reused.
+
+
+# START of configuration
+
+# Replace username and password in the authentication below with the actual
+# username and password for your ISS account.
+AUTHENTICATION = ("username", "password")
+
+# The number of items that are read ahead while your code handles the
+# current item. Reading ahead also starts the request for the next page
+# before the current page has been handled.
+PREFETCH_ITEMS = 200
+
+# The size in bytes of the pieces in which a page is read and decoded.
+CHUNK_SIZE = 64 * 1024
+
+# NOTE: Writing credentials into a script is not a secure practise but it makes
+# a quick and easy start possible. Choose a more secure approach for usage
+# beyond this tutorial.
+
+# END of configuration
+
+
+# The URL to the collection of units in your ISS account.
+URL = "https://iss.intinor.com/api/v1/units"
+
+# The path of keys to the list of units in a collection page. Adjust it if the
+# entries of your collection are found elsewhere, e.g. use ["units"] for a page
+# like {"_links": ..., "units": [...]} or [] if the page itself is the list.
+ITEMS_PATH = ["_embedded", "units"]
+
+
+class ItemStreamDecoder:
+    """Decodes the items of a collection page while the page is read.
+
+    The items are the entries of the list at "items_path", a list of keys
+    like ITEMS_PATH. Everything else in the page, like "_links", is kept as
+    text and decoded by "document" once the page has been read.
+    """
+
+    def __init__(self, items_path):
+        self.items_path = list(items_path)
+        self.decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.outside_items = []
+
+        # One entry per open object or list, as [opening character, key of
+        # the current value]. "expect_key" is True where an object key comes
+        # next, and "string" holds the text of the string being read.
+        self.containers = []
+        self.expect_key = False
+        self.string = None
+        self.escape = False
+
+        self.in_items = False
+        self.items_found = False
+
+    def path(self):
+        """Return the keys leading to the current position, or None if the
+        position is inside a list
+        """
+
+        if any(opening == "[" for opening, _ in self.containers):
+            return None
+        return [key for _, key in self.containers]
+
+    def feed(self, text):
+        """Add the next piece of the page and return the items that are
+        complete
+        """
+
+        buffer = self.buffer + text
+        items = []
+        position = 0
+
+        while position < len(buffer):
+            if self.in_items:
+                # Skip the separators between two items.
+                while (position < len(buffer) and
+                       buffer[position] in " \t\r\n,"):
+                    position += 1
+                if position == len(buffer):
+                    break
+
+                if buffer[position] == "]":
+                    self.in_items = False
+                    self.outside_items.append("]")
+                    self.containers.pop()
+                    position += 1
+                    continue
+
+                try:
+                    item, end = self.decoder.raw_decode(buffer, position)
+                except ValueError:
+                    # The item is not complete yet, wait for the next piece.
+                    break
+
+                # An item is only complete once a separator follows it. A
+                # number at the end of a piece may continue in the next one,
+                # e.g. a piece ending with "1." or "1e" is decoded as 1.
+                # Such a number is decoded again with the next piece. If it
+                # never completes, "document" reports the incomplete page.
+                if end == len(buffer):
+                    break
+                if buffer[end] not in " \t\r\n,]":
+                    if (isinstance(item, (int, float)) and
+                            buffer[end] in "0123456789.eE+-"):
+                        break
+                    raise ValueError("Invalid item in collection page")
+
+                items.append(item)
+                position = end
+                continue
+
+            character = buffer[position]
+            self.outside_items.append(character)
+            position += 1
+
+            if self.string is not None:
+                if self.escape:
+                    self.escape = False
+                elif character == "\\":
+                    self.escape = True
+                elif character == '"':
+                    if self.expect_key:
+                        self.containers[-1][1] = json.loads(
+                            '"' + self.string + '"')
+                    self.string = None
+                    continue
+                self.string += character
+            elif character == '"':
+                self.string = ""
+            elif character in "{[":
+                if (character == "[" and not self.items_found and
+                        self.path() == self.items_path):
+                    self.in_items = True
+                    self.items_found = True
+                self.containers.append([character, None])
+                self.expect_key = character == "{"
+            elif character in "}]":
+                self.containers.pop()
+                self.expect_key = False
+            elif character == ",":
+                self.expect_key = self.containers[-1][0] == "{"
+            elif character == ":":
+                self.expect_key = False
+
+        # Only the incomplete rest is kept, so the memory usage depends on
+        # the size of one item and not on the size of the page.
+        self.buffer = buffer[position:]
+
+        return items
+
+    def document(self):
+        """Return the page without its items, e.g. to follow its links"""
+
+        if self.buffer.strip() or self.containers or self.string is not None:
+            raise ValueError("Incomplete collection page")
+
+        if not self.items_found:
+            raise ValueError("No list at '" + "/".join(self.items_path) +
+                             "' in collection page")
+
+        return json.loads("".join(self.outside_items))
+
+
+def iterate_collection(url, session, items_path=ITEMS_PATH, **kwargs):
+    """Yield the items of a collection, i.e. the entries of the list at
+    "items_path", following the "next" links from page to page. The pages are
+    read in a background thread that stays up to "PREFETCH_ITEMS" items
+    ahead.
+    """
+
+    items = queue.Queue(maxsize=PREFETCH_ITEMS)
+    done = object()
+    stopped = threading.Event()
+
+    def put(item):
+        # Give up if the caller stopped iterating, instead of waiting for
+        # free space forever.
+        while not stopped.is_set():
+            try:
+                items.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def read_pages():
+        try:
+            next_url = url
+            while next_url:
+                with session.get(next_url, stream=True,
+                                 **kwargs) as response:
+                    if not response.ok:
+                        print(response.text)
+                        put(SystemExit("GET '" + next_url + "' failed."))
+                        return
+
+                    # Decode the page piece by piece as it arrives.
+                    response.encoding = response.encoding or "utf-8"
+                    decoder = ItemStreamDecoder(items_path)
+                    for text in response.iter_content(CHUNK_SIZE,
+                                                      decode_unicode=True):
+                        for item in decoder.feed(text):
+                            if not put(item):
+                                return
+
+                    page = decoder.document()
+
+                links = (page.get("_links", {}) if isinstance(page, dict)
+                         else {})
+                next_href = links.get("next", {}).get("href")
+                next_url = urljoin(next_url, next_href) if next_href else None
+
+            put(done)
+        except Exception as error:
+            put(error)
+
+    threading.Thread(target=read_pages, daemon=True).start()
+
+    try:
+        while True:
+            item = items.get()
+            if item is done:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stopped.set()
+
+
+def main():
+    """List the units of the ISS account"""
+
+    start = time.monotonic()
+    count = 0
+
+    with requests.Session() as session:
+        for unit in iterate_collection(URL, session, auth=AUTHENTICATION):
+            if count == 0:
+                print("First unit after " +
+                      str(round(time.monotonic() - start, 2)) + " seconds")
+
+            # Handle each unit here, e.g. show its ID and name.
+            print(unit.get("id"), unit.get("name"))
+            count += 1
+
+    if count == 0:
+        sys.exit("No units found.")
+
+    print("Listed " + str(count) + " units in " +
+          str(round(time.monotonic() - start, 2)) + " seconds")
+
+
+if __name__ == '__main__':
+    main()
+
+
+# "iterate_collection" also works for other collections that link to their next
+# page through "_links", when "items_path" is set to their list of entries.
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+
+"""Intinor Direkt API Python tutorial
+
+Example 15: Keep a local index of the units in an ISS account and their
+            capabilities
+
+Usage:
+    example_15_unit_discovery_index.py refresh
+    example_15_unit_discovery_index.py find [attribute=value ...]
+
+Examples:
+    example_15_unit_discovery_index.py find id=D0****
+    example_15_unit_discovery_index.py find route=recording
+    example_15_unit_discovery_index.py find type=Direkt\\ Receiver encoders=1
+"""
+
+import sys
+import json
+import time
+from urllib.parse import urljoin
+from concurrent.futures import ThreadPoolExecutor
+
+# The "direkt" module wraps the "requests" library with some convenient
+# functionality for the Direkt API.
+import direkt
+
+
+# START of configuration
+
+# Replace username and password in the authentication below with the actual
+# username and password for your ISS account.
+AUTHENTICATION = ("username", "password")
+
+# The index is stored in and read from this file.
+UNIT_INDEX_FILE = "./unit_index.json"
+
+# A unit is only queried again on "refresh" if it is new, if its entry in the
+# ISS listing has changed or if it was last queried more than "MAX_AGE"
+# seconds ago.
+MAX_AGE = 24 * 60 * 60
+
+# The maximum number of requests that are sent at the same time.
+MAX_PARALLEL_REQUESTS = 16
+
+# A request is given up after "REQUEST_TIMEOUT" seconds, so a unit that does
+# not answer does not hold up the refresh of the other units.
+REQUEST_TIMEOUT = 10
+
+# NOTE: Writing credentials into a script is not a secure practise but it makes
+# a quick and easy start possible. Choose a more secure approach for usage
+# beyond this tutorial.
+
+# END of configuration
+
+
+# The URL to the collection of units in your ISS account.
+URL = "https://iss.intinor.com/api/v1/units"
+
+# The paths of keys to the list of entries in each kind of collection, like
+# "ITEMS_PATH" in Example 14. Adjust them if the entries of your collections
+# are found elsewhere, e.g. use ["units"] for a collection like
+# {"_links": ..., "units": [...]}.
+ITEMS_PATHS = {
+    "units": ["_embedded", "units"],
+    "encoders": ["_embedded", "encoders"],
+    "video_inputs": ["_embedded", "video_inputs"],
+}
+
+# The index file format version.
+INDEX_VERSION = 1
+
+
+def get_json(url):
+    """Help function to obtain a resource as a Python dictionary. Raises
+    ValueError if the request failed, so that a failing unit can be handled
+    without ending the script.
+    """
+
+    response = direkt.get(url, auth=AUTHENTICATION, timeout=REQUEST_TIMEOUT)
+
+    if not response.ok:
+        raise ValueError("GET '" + url + "' failed: " + response.text)
+
+    return response.json()
+
+
+def collection_items(collection, name):
+    """Help function to return the entries of a collection of the kind
+    "name". Raises ValueError if the collection has no list of entries at
+    the configured path, instead of counting it as empty.
+    """
+
+    items = collection
+    for key in ITEMS_PATHS[name]:
+        items = items.get(key) if isinstance(items, dict) else None
+
+    if not isinstance(items, list):
+        raise ValueError("No list at '" + "/".join(ITEMS_PATHS[name]) +
+                         "' in the " + name + " collection")
+
+    return items
+
+
+def list_units():
+    """Obtain the entries of all units in the ISS account, following the
+    "next" links from page to page. See Example 14 for how to do this
+    without loading whole pages into memory.
+    """
+
+    units = []
+    url = URL
+
+    while url:
+        page = get_json(url)
+        units.extend(collection_items(page, "units"))
+
+        next_href = page.get("_links", {}).get("next", {}).get("href")
+        url = urljoin(url, next_href) if next_href else None
+
+    return units
+
+
+def describe_unit(listing):
+    """Query a unit's API root and collections and return its index entry"""
+
+    direkt_id = listing["id"]
+    unit_url = URL + "/" + direkt_id
+    root = get_json(unit_url)
+
+    # The routes that the unit offers, e.g. "recording" is only offered by
+    # Direkt Link and Direkt Router.
+    routes = sorted(key for key in root.get("_links", {}) if key != "self")
+
+    entry = {
+        "id": direkt_id,
+        "name": listing.get("name", root.get("name")),
+        "type": root.get("type", listing.get("type")),
+        "routes": routes,
+        "listing": listing,
+        "refreshed": time.time(),
+    }
+
+    # Count the encoders and video inputs, if the unit has any.
+    for collection in ("encoders", "video_inputs"):
+        entry[collection] = (
+            len(collection_items(get_json(unit_url + "/" + collection),
+                                 collection))
+            if collection in routes else 0)
+
+    return entry
+
+
+def try_describe_unit(listing):
+    """Help function to describe a unit. Returns the index entry and None, or
+    None and an error message if the unit could not be queried.
+    """
+
+    try:
+        return describe_unit(listing), None
+    except (OSError, ValueError) as error:
+        # Connection errors, failed requests and unexpected collections.
+        return None, str(error)
+
+
+class UnitIndex:
+    """The local index of units with lookup by ID and by attribute"""
+
+    def __init__(self, units):
+        self.units = units
+
+        # Lookup tables from (attribute, value) to unit IDs. Every route is
+        # listed as its own "route" attribute.
+        self.by_attribute = {}
+        for direkt_id, entry in units.items():
+            pairs = [("route", route) for route in entry["routes"]]
+            pairs += [(attribute, str(entry[attribute])) for attribute in
+                      ("name", "type", "encoders", "video_inputs")]
+            for pair in pairs:
+                self.by_attribute.setdefault(pair, set()).add(direkt_id)
+
+    @classmethod
+    def load(cls):
+        """Read the index file, or start with an empty index"""
+
+        try:
+            with open(UNIT_INDEX_FILE) as index_file:
+                stored = json.load(index_file)
+        except FileNotFoundError:
+            return cls({})
+
+        if stored.get("version") != INDEX_VERSION:
+            return cls({})
+
+        return cls(stored["units"])
+
+    def save(self):
+        """Write the index file"""
+
+        with open(UNIT_INDEX_FILE, "w") as index_file:
+            json.dump({"version": INDEX_VERSION, "units": self.units},
+                      index_file, indent=2, sort_keys=True)
+
+    def get(self, direkt_id):
+        """Return the entry of a unit, or None if it is not in the index"""
+
+        return self.units.get(direkt_id)
+
+    def find(self, **attributes):
+        """Return the entries of all units that match all "attributes", e.g.
+        find(route="recording", encoders="2") or find(id="D0****")
+        """
+
+        # A unit ID is looked up directly, like "get" does.
+        if "id" in attributes:
+            direkt_id = str(attributes.pop("id"))
+            matches = {direkt_id} if direkt_id in self.units else set()
+        else:
+            matches = set(self.units)
+
+        for attribute, value in attributes.items():
+            matches &= self.by_attribute.get((attribute, str(value)), set())
+
+        return [self.units[direkt_id] for direkt_id in sorted(matches)]
+
+    def refresh(self):
+        """Update the index from the ISS listing, querying only the units
+        that are new, changed or outdated. Returns the updated index.
+        """
+
+        try:
+            listings = {listing["id"]: listing for listing in list_units()}
+        except (OSError, ValueError) as error:
+            sys.exit(str(error))
+
+        now = time.time()
+
+        outdated = [listing for direkt_id, listing in listings.items()
+                    if direkt_id not in self.units or
+                    self.units[direkt_id]["listing"] != listing or
+                    now - self.units[direkt_id]["refreshed"] > MAX_AGE]
+
+        with ThreadPoolExecutor(MAX_PARALLEL_REQUESTS) as executor:
+            results = list(executor.map(try_describe_unit, outdated))
+
+        # Units that are no longer listed are removed from the index.
+        units = {direkt_id: entry for direkt_id, entry in self.units.items()
+                 if direkt_id in listings}
+
+        # A unit that could not be queried keeps its previous entry, if it
+        # has one, and is queried again on the next refresh.
+        failed = 0
+        for listing, (entry, error) in zip(outdated, results):
+            if error:
+                failed += 1
+                print(listing["id"] + ": " + error)
+            else:
+                units[entry["id"]] = entry
+
+        print("Queried " + str(len(outdated) - failed) + " of " +
+              str(len(listings)) + " units, " + str(failed) + " failed")
+
+        return UnitIndex(units)
+
+
+def main():
+    """Refresh the index or look up units, depending on the command line"""
+
+    if len(sys.argv) < 2 or sys.argv[1] not in ("refresh", "find"):
+        sys.exit(__doc__)
+
+    index = UnitIndex.load()
+
+    if sys.argv[1] == "refresh":
+        index = index.refresh()
+        index.save()
+        return
+
+    try:
+        attributes = dict(argument.split("=", 1) for argument in sys.argv[2:])
+    except ValueError:
+        sys.exit(__doc__)
+
+    for entry in index.find(**attributes):
+        print(entry["id"], entry["name"], entry["type"],
+              "encoders=" + str(entry["encoders"]),
+              "video_inputs=" + str(entry["video_inputs"]),
+              "routes=" + ",".join(entry["routes"]))
+
+
+if __name__ == '__main__':
+    main()
+
+
+# Other scripts can use the index through "UnitIndex.load()", e.g. to start
+# recording only on the units that offer the "recording" route (Example 5).